@@ -1,112 +1,239 @@
+import asyncio
+import importlib.util
+from functools import lru_cache
 import streamlit as st
-import requests
 try:
-    from bs4 import BeautifulSoup
+    import aiohttp
 except ModuleNotFoundError:
     raise ModuleNotFoundError(
-        "The 'bs4' module is not installed. Install it by running 'pip install beautifulsoup4'."
+        "The 'aiohttp' module is not installed. Install it by running 'pip install aiohttp'."
     )
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ModuleNotFoundError:
+    HTMLParser = None
+    try:
+        from bs4 import BeautifulSoup
+    except ModuleNotFoundError:
+        raise ModuleNotFoundError(
+            "Neither 'selectolax' nor 'bs4' is installed. Install one by running 'pip install selectolax'."
+        )
+import numpy as np
 import pandas as pd
 import urllib.parse
 try:
-    from textblob import TextBlob
+    from textblob.sentiments import PatternAnalyzer
 except ModuleNotFoundError:
     raise ModuleNotFoundError(
         "The 'textblob' module is not installed. Install it by running 'pip install textblob'."
     )
 import plotly.express as px
 
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate"
+}
+MAX_CANDIDATES = 5  # Review pages fetched concurrently per business
+BING_API_URL = "https://api.bing.microsoft.com/v7.0/search"
+SEARCH_CACHE_TTL = 86400  # Search results change slowly; reuse them for a day
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3)  # Keep Streamlit workers from hanging
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.3  # Seconds, doubled on every retry
+
+# Band edges for sentiment labels; polarity exactly 0 is its own "Neutral" band
+SENTIMENT_BOUNDS = (-0.5, 0.0, 0.5)
+SENTIMENT_LABELS = ("Very Negative", "Negative", "Neutral", "Positive", "Very Positive")
+
+# One shared analyzer so the pattern lexicon is loaded once per process
+_ANALYZER = PatternAnalyzer()
+
+# Review/rating anchors, matched inside the parser instead of in Python
+REVIEW_LINK_SELECTOR = 'a[href*="review"], a[href*="rating"]'
+
+# BeautifulSoup fallback parser when selectolax is unavailable
+BS4_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+def _iter_review_hrefs(html: str):
+    """
+    Yield review/rating link hrefs in document order using the fastest available parser
+    """
+    if HTMLParser is not None:
+        for node in HTMLParser(html).css(REVIEW_LINK_SELECTOR):
+            yield node.attributes['href']
+    else:
+        for link in BeautifulSoup(html, BS4_PARSER).select(REVIEW_LINK_SELECTOR):
+            yield link['href']
+
+def _paragraph_texts(html: str, limit: int) -> list:
+    """
+    Stripped text of the first `limit` paragraphs on the page
+    """
+    if HTMLParser is not None:
+        return [node.text(strip=True) for node in HTMLParser(html).css('p')[:limit]]
+    soup = BeautifulSoup(html, BS4_PARSER)
+    return [element.get_text(strip=True) for element in soup.find_all('p', limit=limit)]
+
+def _bing_api_key():
+    """
+    Bing Web Search API key from secrets, or None to fall back to HTML scraping
+    """
+    try:
+        return st.secrets["BING_KEY"]
+    except (KeyError, FileNotFoundError):
+        return None
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.split()).lower()
+
+@st.cache_data(ttl=SEARCH_CACHE_TTL, show_spinner=False)
+def _cached_search(normalized_query: str, max_candidates: int) -> dict:
+    """
+    Candidate review links per normalized query; failed searches raise and are not cached
+    """
+    return asyncio.run(ReviewScraper(max_candidates)._search(normalized_query))
+
+@lru_cache(maxsize=4096)
+def _polarity(text: str) -> float:
+    """
+    TextBlob pattern polarity, memoized on the raw text since scraped pages repeat boilerplate
+    """
+    polarity, _ = _ANALYZER.analyze(text)
+    return polarity
+
 class ReviewScraper:
-    def __init__(self):
-        pass
+    def __init__(self, max_candidates: int = MAX_CANDIDATES):
+        self.max_candidates = max_candidates
 
-    def search_business(self, query: str) -> dict:
+    def analyze_business(self, query: str) -> tuple:
+        """
+        Search for a business (cached per query) and scrape its review pages concurrently.
         """
-        Enhanced search for a business using Bing Search Engine.
+        try:
+            search_result = _cached_search(_normalize_query(query), self.max_candidates)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            st.error(f"Error searching for business: {e}")
+            return None, []
+
+        search_result = dict(search_result, name=query)
+        return search_result, asyncio.run(self._scrape(search_result))
+
+    def _session(self) -> aiohttp.ClientSession:
+        # One pooled session per event loop so all requests in it reuse connections
+        connector = aiohttp.TCPConnector(limit=8, ttl_dns_cache=300)
+        return aiohttp.ClientSession(headers=HEADERS, connector=connector, timeout=REQUEST_TIMEOUT)
+
+    async def _search(self, query: str) -> dict:
+        async with self._session() as session:
+            return await self.search_business(session, query)
+
+    async def _scrape(self, search_result: dict) -> list:
+        async with self._session() as session:
+            return await self.scrape_reviews(session, search_result)
+
+    async def _afetch(self, session: aiohttp.ClientSession, url: str, as_json: bool = False, **kwargs):
+        # Retry dropped connections and timeouts; HTTP error statuses fail immediately
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with session.get(url, **kwargs) as response:
+                    response.raise_for_status()
+                    return await (response.json() if as_json else response.text())
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == MAX_RETRIES:
+                    raise
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+    async def search_business(self, session: aiohttp.ClientSession, query: str) -> dict:
         """
+        Enhanced search for a business using the Bing Web Search API, or the
+        Bing results page when no API key is configured.
+        Collects up to `max_candidates` candidate review links.
+        """
+        api_key = _bing_api_key()
+        if api_key:
+            candidates = await self._search_api(session, query, api_key)
+        else:
+            candidates = await self._search_html(session, query)
+
+        return {
+            "name": query,
+            "url": candidates[0] if candidates else None,
+            "candidates": candidates
+        }
+
+    async def _search_api(self, session: aiohttp.ClientSession, query: str, api_key: str) -> list:
+        # ~1 KB of JSON instead of a full results page to download and parse
+        data = await self._afetch(
+            session,
+            BING_API_URL,
+            as_json=True,
+            params={"q": f"{query} reviews", "count": self.max_candidates},
+            headers={"Ocp-Apim-Subscription-Key": api_key}
+        )
+        pages = data.get("webPages", {}).get("value", [])
+        return [page["url"] for page in pages[:self.max_candidates]]
+
+    async def _search_html(self, session: aiohttp.ClientSession, query: str) -> list:
         encoded_query = urllib.parse.quote(f"{query} reviews")
         search_url = f"https://www.bing.com/search?q={encoded_query}"
+        html = await self._afetch(session, search_url)
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
+        # Extract relevant links, stopping once enough candidates are found
+        candidates = []
+        for href in _iter_review_hrefs(html):
+            # Ensure the URL has a scheme
+            full_url = urllib.parse.urljoin("https://www.bing.com", href)
+            if full_url not in candidates:
+                candidates.append(full_url)
+            if len(candidates) == self.max_candidates:
+                break
 
-        try:
-            response = requests.get(search_url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Extract all relevant links
-            links = soup.find_all('a', href=True)
-            for link in links:
-                href = link['href']
-                if "review" in href or "rating" in href:
-                    # Ensure the URL has a scheme
-                    full_url = urllib.parse.urljoin("https://www.bing.com", href)
-                    return {"name": query, "url": full_url}
-
-            return {"name": query, "url": None}
-        except requests.exceptions.RequestException as e:
-            st.error(f"Error searching for business: {e}")
-            return None
+        return candidates
 
-    def scrape_reviews(self, search_result: dict) -> list:
+    async def scrape_reviews(self, session: aiohttp.ClientSession, search_result: dict) -> list:
         """
-        Enhanced scraping for reviews
+        Enhanced scraping for reviews, fetching all candidate pages concurrently
         """
         if not search_result or not search_result.get('url'):
             return []
 
-        try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            response = requests.get(search_result['url'], headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Attempt to locate review elements
-            review_elements = soup.find_all('p')  # Adjust tag based on website structure
-            reviews = []
-
-            for element in review_elements[:10]:  # Limit to 10 reviews
-                review_text = element.get_text(strip=True)
+        pages = await asyncio.gather(
+            *(self._afetch(session, url) for url in search_result['candidates']),
+            return_exceptions=True
+        )
+
+        texts = []
+        errors = []
+        for page in pages:
+            if isinstance(page, Exception):
+                errors.append(page)
+                continue
+
+            # Attempt to locate review elements (adjust tag based on website structure)
+            for review_text in _paragraph_texts(page, limit=10):  # Limit to 10 reviews per page
                 if len(review_text) > 30:  # Filter irrelevant/short texts
-                    sentiment = self.advanced_sentiment_analysis(review_text)
-                    reviews.append({
-                        "text": review_text,
-                        "sentiment_score": sentiment['score'],
-                        "sentiment_label": sentiment['label']
-                    })
-
-            return reviews
-        except requests.exceptions.RequestException as e:
-            st.error(f"Error scraping reviews: {e}")
-            return []
+                    texts.append(review_text)
+
+        if errors and len(errors) == len(pages):
+            st.error(f"Error scraping reviews: {errors[0]}")
+
+        scores, labels = self.batch_sentiment_analysis(texts)
+        return [
+            {
+                "text": review_text,
+                "sentiment_score": score,
+                "sentiment_label": label
+            } for review_text, score, label in zip(texts, scores.tolist(), labels.tolist())
+        ]
 
-    def advanced_sentiment_analysis(self, text: str) -> dict:
+    def batch_sentiment_analysis(self, texts: list) -> tuple:
         """
-        Perform advanced sentiment analysis using TextBlob
+        Score a batch of texts and label them in one vectorized lookup
         """
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
-
-        # Categorize sentiment
-        if polarity > 0.5:
-            label = "Very Positive"
-        elif polarity > 0:
-            label = "Positive"
-        elif polarity == 0:
-            label = "Neutral"
-        elif polarity > -0.5:
-            label = "Negative"
-        else:
-            label = "Very Negative"
-
-        return {
-            "score": polarity,
-            "label": label
-        }
+        polarities = np.fromiter(map(_polarity, texts), dtype=np.float64, count=len(texts))
+        # side='left' counts the edges strictly below each polarity; non-negative
+        # polarities move up one slot so that 0 lands on "Neutral"
+        indices = np.searchsorted(SENTIMENT_BOUNDS, polarities, side='left') + (polarities >= 0)
+        return polarities, np.array(SENTIMENT_LABELS)[indices]
 
 def main():
     st.set_page_config(page_title="Business Review Analysis", layout="wide")
@@ -123,13 +250,10 @@ def main():
         else:
             scraper = ReviewScraper()
 
-            # Search for Business
-            search_result = scraper.search_business(business_name)
+            # Search for Business and Scrape Reviews
+            search_result, reviews = scraper.analyze_business(business_name)
 
             if search_result and search_result.get('url'):
-                # Scrape Reviews
-                reviews = scraper.scrape_reviews(search_result)
-
                 # Display Results
                 st.header(f"Business Insights: {search_result['name']}")
 
@@ -157,6 +281,7 @@ if __name__ == "__main__":
     main()
 
 # Note:
-# 1. This script uses Bing Search instead of Google to fetch business links.
+# 1. This script uses Bing instead of Google to fetch business links: the Bing Web Search API
+#    when BING_KEY is set in .streamlit/secrets.toml, otherwise the Bing results page.
 # 2. Web scraping results depend on the structure of the target page and may require adjustments.
 # 3. Use APIs like Yelp or similar for more reliable and detailed data.
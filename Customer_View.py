@@ -1,114 +1,118 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import json
+try:
+    from orjson import loads as json_loads  # Faster statement parsing when available
+except ModuleNotFoundError:
+    from json import loads as json_loads
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-import re
 from bs4 import BeautifulSoup
 
-def clean_date(date_str):
-    """Clean date string by removing INB suffix if present"""
-    return re.sub(r'INB$', '', date_str)
+AMOUNT_COLUMNS = ['credit', 'debit', 'balance']
 
 def prepare_transaction_data(transactions):
     df = pd.DataFrame(transactions)
     
-    # Clean date strings and convert to datetime
-    df['date'] = df['date'].apply(clean_date)
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%y')
-    df['month'] = df['date'].dt.month
-    df['day_of_week'] = df['date'].dt.dayofweek
+    # Strip the INB suffix and convert to datetime; repeated dates are parsed once
+    df['date'] = pd.to_datetime(df['date'].str.removesuffix('INB'), format='%d-%m-%y', cache=True)
+    df['month'] = df['date'].dt.month.astype('int8')
+    df['day_of_week'] = df['date'].dt.dayofweek.astype('int8')
     
-    # Convert amount columns to float
-    df['credit'] = pd.to_numeric(df['credit'], errors='coerce').fillna(0)
-    df['debit'] = pd.to_numeric(df['debit'], errors='coerce').fillna(0)
-    df['balance'] = pd.to_numeric(df['balance'], errors='coerce').fillna(0)
+    # Convert amount columns to float in one pass
+    df[AMOUNT_COLUMNS] = df[AMOUNT_COLUMNS].apply(pd.to_numeric, errors='coerce').fillna(0)
     
     return df
 
-def categorize_nano_entrepreneur_transactions(description):
-    """Enhanced transaction categorization for nano-entrepreneurs"""
-    categories = {
-        'BUSINESS_INCOME': ['SALARY', 'INVESTMENT', 'BONUS', 'RETURNS', 'CREDIT'],
-        'BUSINESS_EXPENSE': ['UTILITY', 'BILL', 'SHOPPING', 'STORE'],
-        'PERSONAL_EXPENSE': ['COFFEE', 'FOOD', 'BEVERAGES'],
-        'TRANSFER': ['RENT', 'TRANSFER', 'REFUND'],
-        'OTHERS': []
-    }
-    
-    description = str(description).upper()
-    for category, keywords in categories.items():
-        if any(keyword in description for keyword in keywords):
-            return category
-    return 'OTHERS'
-
 def calculate_financial_metrics(df, summary_data):
     metrics = {}
     
+    # Work on the raw arrays and build each mask once
+    credit = df['credit'].to_numpy()
+    debit = df['debit'].to_numpy()
+    balance = df['balance'].to_numpy()
+    credit_mask = credit > 0
+    debit_mask = debit > 0
+    credit_txns = int(credit_mask.sum())
+    
     # Basic transaction metrics
     metrics['total_transactions'] = len(df)
-    metrics['total_credits'] = df['credit'].sum()
-    metrics['total_debits'] = df['debit'].sum()
+    metrics['total_credits'] = credit.sum()
+    metrics['total_debits'] = debit.sum()
     metrics['net_cashflow'] = metrics['total_credits'] - metrics['total_debits']
     
     # Balance metrics
     metrics['opening_balance'] = float(summary_data.get('opening_balance', 0))
     metrics['closing_balance'] = float(summary_data.get('closing_balance', 0))
-    metrics['avg_balance'] = df['balance'].mean()
-    metrics['balance_volatility'] = df['balance'].std()
+    metrics['avg_balance'] = balance.mean() if balance.size else np.nan
+    metrics['balance_volatility'] = balance.std(ddof=1) if balance.size > 1 else np.nan  # sample std, as pandas
     
     # Transaction patterns
-    metrics['avg_transaction_size'] = df['debit'][df['debit'] > 0].mean()
+    metrics['avg_transaction_size'] = debit[debit_mask].mean() if debit_mask.any() else np.nan
     metrics['transaction_frequency'] = len(df) / 30  # transactions per day
     
     # Credit patterns
-    credit_txns = len(df[df['credit'] > 0])
     metrics['credit_frequency'] = credit_txns / max(len(df), 1)
-    metrics['avg_credit_amount'] = df[df['credit'] > 0]['credit'].mean() if credit_txns > 0 else 0
+    metrics['avg_credit_amount'] = credit[credit_mask].mean() if credit_txns > 0 else 0
     
     return metrics
 
+SCORE_COMPONENTS = ('Income Stability', 'Business Resilience', 'Transaction Discipline', 'Growth Potential')
+SCORE_CAPS = np.array([40, 30, 20, 10])  # Maximum points per component
+
 def calculate_nano_entrepreneur_score(metrics):
     """
     Custom scoring for nano-entrepreneurs considering unique financial patterns
     """
-    # Income Stability (40 points)
-    income_stability = min(
+    raw_scores = np.array([
+        # Income Stability (40 points)
         metrics['credit_frequency'] * 20 +  # Frequency of income
-        (metrics['avg_credit_amount'] > 10000) * 20  # Consistent income threshold
-    , 40)
-    
-    # Business Resilience (30 points)
-    business_resilience = min(
+        (metrics['avg_credit_amount'] > 10000) * 20,  # Consistent income threshold
+        
+        # Business Resilience (30 points)
         (metrics['net_cashflow'] > 0) * 20 +  # Positive cash flow
-        (metrics['balance_volatility'] < metrics['avg_balance'] * 0.3) * 10  # Low balance fluctuation
-    , 30)
-    
-    # Transaction Discipline (20 points)
-    transaction_discipline = min(
+        (metrics['balance_volatility'] < metrics['avg_balance'] * 0.3) * 10,  # Low balance fluctuation
+        
+        # Transaction Discipline (20 points)
         (metrics['transaction_frequency'] > 0.5) * 10 +  # Regular transactions
-        (metrics['avg_transaction_size'] < metrics['avg_credit_amount'] * 0.5) * 10  # Controlled spending
-    , 20)
-    
-    # Growth Potential (10 points)
-    growth_potential = min(
+        (metrics['avg_transaction_size'] < metrics['avg_credit_amount'] * 0.5) * 10,  # Controlled spending
+        
+        # Growth Potential (10 points)
         (metrics['closing_balance'] > metrics['opening_balance']) * 5 +
         (metrics['total_credits'] > metrics['total_debits']) * 5
-    , 10)
+    ], dtype=np.float64)
+    
+    # Cap every component at once; the total is the Nano-Entrepreneur Score
+    parts = np.minimum(raw_scores, SCORE_CAPS)
+    nano_score = parts.sum()
+    
+    return {
+        'score': float(np.clip(nano_score, 0, 100)),
+        'breakdown': dict(zip(SCORE_COMPONENTS, parts.tolist()))
+    }
+
+@st.cache_data(show_spinner="Analyzing statement...")
+def process_statement(raw_bytes):
+    """
+    Run the pandas pipeline once per uploaded file instead of on every rerun
+    """
+    bank_data = json_loads(raw_bytes)
     
-    # Total Nano-Entrepreneur Score
-    nano_score = income_stability + business_resilience + transaction_discipline + growth_potential
+    # Process transactions
+    df = prepare_transaction_data(bank_data['transactions'])
+    
+    # Calculate financial metrics
+    metrics = calculate_financial_metrics(df, bank_data['summary'])
+    
+    # Nano Entrepreneur Score
+    nano_score = calculate_nano_entrepreneur_score(metrics)
     
     return {
-        'score': min(max(nano_score, 0), 100),
-        'breakdown': {
-            'Income Stability': income_stability,
-            'Business Resilience': business_resilience,
-            'Transaction Discipline': transaction_discipline,
-            'Growth Potential': growth_potential
-        }
+        'personal_info': bank_data['personal_info'],
+        'summary': bank_data['summary'],
+        'metrics': metrics,
+        'nano_score': nano_score
     }
 
 def main():
@@ -119,25 +123,19 @@ def main():
     
     if uploaded_file is not None:
         try:
-            bank_data = json.load(uploaded_file)
-            
-            # Process transactions
-            df = prepare_transaction_data(bank_data['transactions'])
-            df['category'] = df['description'].apply(categorize_nano_entrepreneur_transactions)
+            result = process_statement(uploaded_file.getvalue())
+            personal_info = result['personal_info']
+            summary = result['summary']
+            metrics = result['metrics']
+            nano_score = result['nano_score']
             
             # Customer Information
             st.header("Entrepreneur Profile")
             col1, col2 = st.columns(2)
             with col1:
-                st.write("Name:", bank_data['personal_info'].get('customer_id', 'N/A'))
-                st.write("Mobile:", bank_data['personal_info'].get('mobile', 'N/A'))
-                st.write("KYC Status:", bank_data['personal_info'].get('kyc_status', 'N/A'))
-            
-            # Calculate financial metrics
-            metrics = calculate_financial_metrics(df, bank_data['summary'])
-            
-            # Nano Entrepreneur Score
-            nano_score = calculate_nano_entrepreneur_score(metrics)
+                st.write("Name:", personal_info.get('customer_id', 'N/A'))
+                st.write("Mobile:", personal_info.get('mobile', 'N/A'))
+                st.write("KYC Status:", personal_info.get('kyc_status', 'N/A'))
             
             # Loan Recommendation Section
             st.header("Financial Health & Loan Recommendation")
@@ -172,14 +170,14 @@ def main():
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.metric("Opening Balance", 
-                         f"₹{float(bank_data['summary']['opening_balance']):,.2f}")
+                         f"₹{float(summary['opening_balance']):,.2f}")
             with col2:
                 st.metric("Closing Balance", 
-                         f"₹{float(bank_data['summary']['closing_balance']):,.2f}")
+                         f"₹{float(summary['closing_balance']):,.2f}")
             with col3:
-                st.metric("Total Credits", f"₹{df['credit'].sum():,.2f}")
+                st.metric("Total Credits", f"₹{metrics['total_credits']:,.2f}")
             with col4:
-                st.metric("Total Debits", f"₹{df['debit'].sum():,.2f}")
+                st.metric("Total Debits", f"₹{metrics['total_debits']:,.2f}")
 
             col1, col2, col3 = st.columns([2, 2, 1])
             with col1:
@@ -1,12 +1,18 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import json
-import plotly.express as px
+try:
+    from orjson import loads as json_loads  # Faster statement parsing when available
+except ModuleNotFoundError:
+    from json import loads as json_loads
 import plotly.graph_objects as go
 from datetime import datetime
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from youtube_search import YoutubeSearch
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Safely access the Google API key
 try:
@@ -18,13 +24,94 @@ except KeyError:
 
 if GOOGLE_API_KEY:
     import google.generativeai as genai
-    genai.configure(api_key=GOOGLE_API_KEY)
 else:
     st.stop()  # Stop execution if the API key is missing
 
+@st.cache_resource
+def get_gemini(model_name):
+    """Configure the SDK once and reuse one model handle across reruns and sessions"""
+    genai.configure(api_key=GOOGLE_API_KEY)
+    return genai.GenerativeModel(model_name)
+
+GEMINI_CACHE_MAX_ENTRIES = 256  # Completed responses kept; the least recently used go first
+_GEMINI_CACHE_LOCK = threading.Lock()  # The cache is shared by every session's script thread
+
+@st.cache_resource(ttl=3600)
+def _gemini_text_cache():
+    """Completed Gemini responses keyed by (model, prompt), shared across sessions for an hour"""
+    return OrderedDict()
+
+def stream_gemini(model_name, prompt):
+    """
+    Stream a Gemini completion into the page as it is generated, replaying the
+    finished text instantly on later reruns
+    """
+    cache = _gemini_text_cache()
+    key = (model_name, prompt)
+    with _GEMINI_CACHE_LOCK:
+        text = cache.get(key)
+        if text is not None:
+            cache.move_to_end(key)
+    if text is not None:
+        st.markdown(text)
+        return text
+
+    response = get_gemini(model_name).generate_content(prompt, stream=True)
+    text = st.write_stream(chunk.text for chunk in response)
+    with _GEMINI_CACHE_LOCK:
+        cache[key] = text
+        cache.move_to_end(key)
+        while len(cache) > GEMINI_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+    return text
+
+GOVERNMENT_RESOURCES = {
+    'English': [
+        {'name': 'RBI Financial Literacy', 'url': 'https://www.rbi.org.in/Scripts/Financial_Literacy.aspx'},
+        {'name': 'SEBI Investor Education', 'url': 'https://www.sebi.gov.in/investor-education.html'}
+    ],
+    'Hindi': [
+        {'name': 'RBI वित्तीय साक्षरता', 'url': 'https://www.rbi.org.in/Scripts/Financial_Literacy.aspx'},
+        {'name': 'SEBI निवेशक शिक्षा', 'url': 'https://www.sebi.gov.in/investor-education.html'}
+    ]
+    # Add more language-specific resources
+}
+
+def score_bucket(score):
+    """Bucket a 0-100 credit score into ranges of 10 (-1 when no score is given)"""
+    return min(int(score // 10), 9) if score else -1
+
+def _credit_improvement_prompt(language, bucket):
+    """Gemini tips prompt for a language and score bucket"""
+    score_range = f"{bucket * 10}-{bucket * 10 + 10}" if bucket >= 0 else 'Not specified'
+    return f"""
+    Generate comprehensive, actionable credit score improvement tips 
+    in {language} language. Provide:
+    - 5-7 specific strategies
+    - Detailed explanation for each strategy
+    - Potential impact on credit score
+    - Practical implementation steps
+    
+    Context:
+    - Current language: {language}
+    - Current credit score: {score_range}
+    """
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _search_youtube(query, language, max_results):
+    """YouTube search results normalized to plain dicts, cached for a day per query and language"""
+    yt_results = YoutubeSearch(f"{query} in {language}", max_results=max_results).to_dict()
+    return [
+        {
+            'title': video['title'],
+            'channel': video['channel'],
+            'thumbnail': video['thumbnails'][0],
+            'link': f"https://youtube.com/watch?v={video['id']}"
+        } for video in yt_results
+    ]
+
 class CreditScoreEnhancer:
-    def __init__(self, api_key):
-        genai.configure(api_key=api_key)
+    def __init__(self):
         self.languages = {
             'English': 'en',
             'Hindi': 'hi',
@@ -36,175 +123,152 @@ class CreditScoreEnhancer:
 
     def generate_localized_credit_improvement_tips(self, language='English', score=None):
         """
-        Generate credit score improvement tips in the specified language
-        """
-        prompt = f"""
-        Generate comprehensive, actionable credit score improvement tips 
-        in {language} language. Provide:
-        - 5-7 specific strategies
-        - Detailed explanation for each strategy
-        - Potential impact on credit score
-        - Practical implementation steps
-        
-        Context:
-        - Current language: {language}
-        - Current credit score: {score or 'Not specified'}
+        Stream credit score improvement tips in the specified language into the page
         """
-
+        prompt = _credit_improvement_prompt(language, score_bucket(score))
+        placeholder = st.empty()
         try:
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            response = model.generate_content(prompt)
-            return response.text
+            with placeholder.container():
+                return stream_gemini('gemini-2.0-flash-exp', prompt)
         except Exception as e:
-            return f"Error generating tips: {str(e)}"
+            tips = f"Error generating tips: {str(e)}"
+            placeholder.markdown(tips)
+            return tips
 
     def fetch_youtube_recommendations(self, query, language='English', max_results=5):
         """
-        Fetch YouTube video recommendations for credit score improvement
+        Fetch YouTube video recommendations for credit score improvement.
+        Errors propagate so the caller can report them where the videos are shown.
         """
-        localized_query = f"{query} in {language}"
-        try:
-            yt_results = YoutubeSearch(localized_query, max_results=max_results).to_dict()
-            return [
-                {
-                    'title': video['title'],
-                    'channel': video['channel'],
-                    'thumbnail': video['thumbnails'][0],
-                    'link': f"https://youtube.com/watch?v={video['id']}"
-                } for video in yt_results
-            ]
-        except Exception as e:
-            st.error(f"Error fetching YouTube videos: {str(e)}")
-            return []
+        return _search_youtube(query.strip(), language, max_results)
 
     def fetch_government_resources(self, language='English'):
         """
         Fetch government and official financial literacy resources
         """
-        resources = {
-            'English': [
-                {'name': 'RBI Financial Literacy', 'url': 'https://www.rbi.org.in/Scripts/Financial_Literacy.aspx'},
-                {'name': 'SEBI Investor Education', 'url': 'https://www.sebi.gov.in/investor-education.html'}
-            ],
-            'Hindi': [
-                {'name': 'RBI वित्तीय साक्षरता', 'url': 'https://www.rbi.org.in/Scripts/Financial_Literacy.aspx'},
-                {'name': 'SEBI निवेशक शिक्षा', 'url': 'https://www.sebi.gov.in/investor-education.html'}
-            ]
-            # Add more language-specific resources
-        }
-        return resources.get(language, resources['English'])
+        return GOVERNMENT_RESOURCES.get(language, GOVERNMENT_RESOURCES['English'])
 
-def clean_date(date_str):
-    """Clean date string by removing INB suffix if present"""
-    return re.sub(r'INB$', '', date_str)
+AMOUNT_COLUMNS = ['credit', 'debit', 'balance']
 
 def prepare_transaction_data(transactions):
     df = pd.DataFrame(transactions)
     
-    # Clean date strings and convert to datetime
-    df['date'] = df['date'].apply(clean_date)
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%y')
-    df['month'] = df['date'].dt.month
-    df['day_of_week'] = df['date'].dt.dayofweek
+    # Strip the INB suffix and convert to datetime; repeated dates are parsed once
+    df['date'] = pd.to_datetime(df['date'].str.removesuffix('INB'), format='%d-%m-%y', cache=True)
+    df['month'] = df['date'].dt.month.astype('int8')
+    df['day_of_week'] = df['date'].dt.dayofweek.astype('int8')
     
-    # Convert amount columns to float
-    df['credit'] = pd.to_numeric(df['credit'], errors='coerce').fillna(0)
-    df['debit'] = pd.to_numeric(df['debit'], errors='coerce').fillna(0)
-    df['balance'] = pd.to_numeric(df['balance'], errors='coerce').fillna(0)
+    # Convert amount columns to float in one pass
+    df[AMOUNT_COLUMNS] = df[AMOUNT_COLUMNS].apply(pd.to_numeric, errors='coerce').fillna(0)
     
     return df
 
-def categorize_nano_entrepreneur_transactions(description):
-    """Enhanced transaction categorization for nano-entrepreneurs"""
-    categories = {
-        'BUSINESS_INCOME': ['SALARY', 'INVESTMENT', 'BONUS', 'RETURNS', 'CREDIT'],
-        'BUSINESS_EXPENSE': ['UTILITY', 'BILL', 'SHOPPING', 'STORE'],
-        'PERSONAL_EXPENSE': ['COFFEE', 'FOOD', 'BEVERAGES'],
-        'TRANSFER': ['RENT', 'TRANSFER', 'REFUND'],
-        'OTHERS': []
-    }
-    
-    description = str(description).upper()
-    for category, keywords in categories.items():
-        if any(keyword in description for keyword in keywords):
-            return category
-    return 'OTHERS'
+# Checked in priority order: a description matching several categories gets the first one
+TRANSACTION_CATEGORIES = {
+    'BUSINESS_INCOME': ['SALARY', 'INVESTMENT', 'BONUS', 'RETURNS', 'CREDIT'],
+    'BUSINESS_EXPENSE': ['UTILITY', 'BILL', 'SHOPPING', 'STORE'],
+    'PERSONAL_EXPENSE': ['COFFEE', 'FOOD', 'BEVERAGES'],
+    'TRANSFER': ['RENT', 'TRANSFER', 'REFUND'],
+    'OTHERS': []
+}
+CATEGORY_PATTERNS = {
+    category: re.compile('|'.join(map(re.escape, keywords)))
+    for category, keywords in TRANSACTION_CATEGORIES.items() if keywords
+}
+
+def categorize_nano_entrepreneur_transactions(descriptions):
+    """Enhanced transaction categorization for nano-entrepreneurs, vectorized over a Series"""
+    upper = descriptions.astype(str).str.upper()
+    masks = [upper.str.contains(pattern, na=False) for pattern in CATEGORY_PATTERNS.values()]
+    labels = np.select(masks, list(CATEGORY_PATTERNS), default='OTHERS')
+    return pd.Series(labels, index=descriptions.index)
+
+CATEGORY_COLORS = {
+    'BUSINESS_INCOME': 'green',
+    'BUSINESS_EXPENSE': 'red',
+    'PERSONAL_EXPENSE': 'blue',
+    'TRANSFER': 'orange',
+    'OTHERS': 'gray'
+}
 
 def calculate_financial_metrics(df, summary_data):
     metrics = {}
     
+    # Work on the raw arrays and build each mask once
+    credit = df['credit'].to_numpy()
+    debit = df['debit'].to_numpy()
+    balance = df['balance'].to_numpy()
+    credit_mask = credit > 0
+    debit_mask = debit > 0
+    credit_txns = int(credit_mask.sum())
+    
     # Basic transaction metrics
     metrics['total_transactions'] = len(df)
-    metrics['total_credits'] = df['credit'].sum()
-    metrics['total_debits'] = df['debit'].sum()
+    metrics['total_credits'] = credit.sum()
+    metrics['total_debits'] = debit.sum()
     metrics['net_cashflow'] = metrics['total_credits'] - metrics['total_debits']
     
     # Balance metrics
     metrics['opening_balance'] = float(summary_data.get('opening_balance', 0))
     metrics['closing_balance'] = float(summary_data.get('closing_balance', 0))
-    metrics['avg_balance'] = df['balance'].mean()
-    metrics['balance_volatility'] = df['balance'].std()
+    metrics['avg_balance'] = balance.mean() if balance.size else np.nan
+    metrics['balance_volatility'] = balance.std(ddof=1) if balance.size > 1 else np.nan  # sample std, as pandas
     
     # Transaction patterns
-    metrics['avg_transaction_size'] = df['debit'][df['debit'] > 0].mean()
+    metrics['avg_transaction_size'] = debit[debit_mask].mean() if debit_mask.any() else np.nan
     metrics['transaction_frequency'] = len(df) / 30  # transactions per day
     
     # Credit patterns
-    credit_txns = len(df[df['credit'] > 0])
     metrics['credit_frequency'] = credit_txns / max(len(df), 1)
-    metrics['avg_credit_amount'] = df[df['credit'] > 0]['credit'].mean() if credit_txns > 0 else 0
+    metrics['avg_credit_amount'] = credit[credit_mask].mean() if credit_txns > 0 else 0
     
     return metrics
 
+SCORE_COMPONENTS = ('Income Stability', 'Business Resilience', 'Transaction Discipline', 'Growth Potential')
+SCORE_CAPS = np.array([40, 30, 20, 10])  # Maximum points per component
+
 def calculate_nano_entrepreneur_score(metrics):
     """
     Custom scoring for nano-entrepreneurs considering unique financial patterns
     """
-    # Income Stability (40 points)
-    income_stability = min(
+    raw_scores = np.array([
+        # Income Stability (40 points)
         metrics['credit_frequency'] * 20 +  # Frequency of income
-        (metrics['avg_credit_amount'] > 10000) * 20  # Consistent income threshold
-    , 40)
-    
-    # Business Resilience (30 points)
-    business_resilience = min(
+        (metrics['avg_credit_amount'] > 10000) * 20,  # Consistent income threshold
+        
+        # Business Resilience (30 points)
         (metrics['net_cashflow'] > 0) * 20 +  # Positive cash flow
-        (metrics['balance_volatility'] < metrics['avg_balance'] * 0.3) * 10  # Low balance fluctuation
-    , 30)
-    
-    # Transaction Discipline (20 points)
-    transaction_discipline = min(
+        (metrics['balance_volatility'] < metrics['avg_balance'] * 0.3) * 10,  # Low balance fluctuation
+        
+        # Transaction Discipline (20 points)
         (metrics['transaction_frequency'] > 0.5) * 10 +  # Regular transactions
-        (metrics['avg_transaction_size'] < metrics['avg_credit_amount'] * 0.5) * 10  # Controlled spending
-    , 20)
-    
-    # Growth Potential (10 points)
-    growth_potential = min(
+        (metrics['avg_transaction_size'] < metrics['avg_credit_amount'] * 0.5) * 10,  # Controlled spending
+        
+        # Growth Potential (10 points)
         (metrics['closing_balance'] > metrics['opening_balance']) * 5 +
         (metrics['total_credits'] > metrics['total_debits']) * 5
-    , 10)
+    ], dtype=np.float64)
     
-    # Total Nano-Entrepreneur Score
-    nano_score = income_stability + business_resilience + transaction_discipline + growth_potential
+    # Cap every component at once; the total is the Nano-Entrepreneur Score
+    parts = np.minimum(raw_scores, SCORE_CAPS)
+    nano_score = parts.sum()
     
     return {
-        'score': min(max(nano_score, 0), 100),
-        'breakdown': {
-            'Income Stability': income_stability,
-            'Business Resilience': business_resilience,
-            'Transaction Discipline': transaction_discipline,
-            'Growth Potential': growth_potential
-        }
+        'score': float(np.clip(nano_score, 0, 100)),
+        'breakdown': dict(zip(SCORE_COMPONENTS, parts.tolist()))
     }
 
 def generate_ai_insights(df, metrics, nano_score):
     """
-    Generate AI-powered insights with fallback for API failures
+    Stream AI-powered insights into the page with fallback for API failures
     """
+    placeholder = st.empty()
     try:
-        # Existing Gemini API logic
-        top_credit_transaction = df[df['credit'] > 0].sort_values('credit', ascending=False).iloc[0]
-        worst_transaction = df[df['debit'] > 0].sort_values('debit', ascending=False).iloc[0]
+        # Existing Gemini API logic; a statement without credits or debits uses the fallback
+        if not (df['credit'].max() > 0 and df['debit'].max() > 0):
+            raise ValueError("No credit or debit transactions to analyze")
+        top_credit_transaction = df.loc[df['credit'].idxmax()]
+        worst_transaction = df.loc[df['debit'].idxmax()]
         
         prompt = f"""
         Analyze the financial data for a nano entrepreneur with the following details:
@@ -233,9 +297,8 @@ def generate_ai_insights(df, metrics, nano_score):
         - Description: {worst_transaction['description']}
         """
         
-        model = genai.GenerativeModel('gemini-pro')
-        response = model.generate_content(prompt)
-        return response.text
+        with placeholder.container():
+            return stream_gemini('gemini-pro', prompt)
     
     except Exception as e:
         # Fallback insights based on financial metrics
@@ -264,8 +327,44 @@ def generate_ai_insights(df, metrics, nano_score):
 3. {'Review and optimize expenses' if income_ratio < 1.5 else 'Maintain current expense management'}
 4. {'Focus on consistent transactions' if nano_score['breakdown']['Transaction Discipline'] < 15 else 'Keep up disciplined transaction patterns'}
 """
+        placeholder.write(insights)
         return insights
 
+@st.cache_data(show_spinner="Analyzing statement...")
+def analyze_statement(raw_bytes):
+    """
+    Run the pandas pipeline once per uploaded file instead of on every rerun
+    """
+    bank_data = json_loads(raw_bytes)
+
+    # Process transactions
+    df = prepare_transaction_data(bank_data['transactions'])
+    df['category'] = pd.Categorical(
+        categorize_nano_entrepreneur_transactions(df['description']),
+        categories=list(TRANSACTION_CATEGORIES)
+    )
+
+    # Calculate financial metrics
+    metrics = calculate_financial_metrics(df, bank_data['summary'])
+
+    # Nano Entrepreneur Score
+    nano_score = calculate_nano_entrepreneur_score(metrics)
+
+    # Per-category totals in one grouped pass, shared by all charts
+    category_totals = df.groupby('category', observed=True).agg(
+        debit_sum=('debit', 'sum'),
+        credit_sum=('credit', 'sum')
+    )
+
+    return {
+        'personal_info': bank_data['personal_info'],
+        'summary': bank_data['summary'],
+        'df': df,
+        'metrics': metrics,
+        'nano_score': nano_score,
+        'category_totals': category_totals
+    }
+
 def display_credit_score_improvement_section(credit_score, selected_language):
     """
     Display credit score improvement strategies section
@@ -273,30 +372,46 @@ def display_credit_score_improvement_section(credit_score, selected_language):
     st.header("💡 Credit Score Improvement Strategies")
     
     # Initialize Credit Score Enhancer
-    enhancer = CreditScoreEnhancer(GOOGLE_API_KEY)
+    enhancer = CreditScoreEnhancer()
 
-    # Generate Localized Tips
-    st.subheader(f"Credit Improvement Tips in {selected_language}")
-    tips = enhancer.generate_localized_credit_improvement_tips(
-        language=selected_language, 
-        score=credit_score
-    )
-    st.markdown(tips)
+    # Fetch videos in the background while the Gemini tips stream in. The worker
+    # shares this script's run context for the cached helper, but never draws
+    # anything itself; its result or error is rendered below on this thread.
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=1, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        videos_future = executor.submit(
+            enhancer.fetch_youtube_recommendations,
+            "credit score improvement financial literacy", 
+            language=selected_language
+        )
+
+        # Generate Localized Tips
+        st.subheader(f"Credit Improvement Tips in {selected_language}")
+        enhancer.generate_localized_credit_improvement_tips(
+            language=selected_language, 
+            score=credit_score
+        )
+
+        try:
+            videos, video_error = videos_future.result(), None
+        except Exception as e:
+            videos, video_error = [], e
 
     # YouTube Recommendations
     st.subheader("📹 Recommended Learning Videos")
-    videos = enhancer.fetch_youtube_recommendations(
-        "credit score improvement financial literacy", 
-        language=selected_language
-    )
     
     # Display Video Recommendations
-    cols = st.columns(len(videos))
-    for i, video in enumerate(videos):
-        with cols[i]:
-            st.image(video['thumbnail'], use_container_width=True)
-            st.write(video['title'])
-            st.link_button("Watch Video", video['link'])
+    if video_error is not None:
+        st.error(f"Error fetching YouTube videos: {str(video_error)}")
+    elif videos:
+        cols = st.columns(len(videos))
+        for i, video in enumerate(videos):
+            with cols[i]:
+                st.image(video['thumbnail'], use_container_width=True)
+                st.write(video['title'])
+                st.link_button("Watch Video", video['link'])
+    else:
+        st.info("No videos available right now.")
 
     # Government Resources
     st.subheader("🏛️ Official Financial Resources")
@@ -312,7 +427,7 @@ def main():
     st.sidebar.header("🌐 Language Preference")
     selected_language = st.sidebar.selectbox(
         "Choose Your Preferred Language", 
-        list(CreditScoreEnhancer('').languages.keys())
+        list(CreditScoreEnhancer().languages.keys())
     )
     
     # Sidebar Tips
@@ -329,28 +444,21 @@ def main():
     
     if uploaded_file is not None:
         try:
-            bank_data = json.load(uploaded_file)
-            
-            # Process transactions
-            df = prepare_transaction_data(bank_data['transactions'])
-            df['category'] = df['description'].apply(categorize_nano_entrepreneur_transactions)
-            
-            # Calculate financial metrics
-            metrics = calculate_financial_metrics(df, bank_data['summary'])
-            
-            # Nano Entrepreneur Score
-            nano_score = calculate_nano_entrepreneur_score(metrics)
-            
-            # Generate AI Insights
-            ai_insights = generate_ai_insights(df, metrics, nano_score)
+            result = analyze_statement(uploaded_file.getvalue())
+            personal_info = result['personal_info']
+            summary = result['summary']
+            df = result['df']
+            metrics = result['metrics']
+            nano_score = result['nano_score']
+            category_totals = result['category_totals']
             
             # Entrepreneur Profile Section
             st.header("📊 Entrepreneur Profile")
             col1, col2 = st.columns(2)
             with col1:
-                st.write("Name:", bank_data['personal_info'].get('customer_id', 'N/A'))
-                st.write("Mobile:", bank_data['personal_info'].get('mobile', 'N/A'))
-                st.write("KYC Status:", bank_data['personal_info'].get('kyc_status', 'N/A'))
+                st.write("Name:", personal_info.get('customer_id', 'N/A'))
+                st.write("Mobile:", personal_info.get('mobile', 'N/A'))
+                st.write("KYC Status:", personal_info.get('kyc_status', 'N/A'))
             
             # Nano Entrepreneur Score Section
             with col2:
@@ -361,50 +469,50 @@ def main():
             
             # AI-Powered Insights Section
             st.header("🤖 AI-Powered Financial Insights")
-            st.write(ai_insights)
+            generate_ai_insights(df, metrics, nano_score)
             
             # Account Summary
             st.header("💰 Account Summary")
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.metric("Opening Balance", 
-                         f"₹{float(bank_data['summary']['opening_balance']):,.2f}")
+                         f"₹{float(summary['opening_balance']):,.2f}")
             with col2:
                 st.metric("Closing Balance", 
-                         f"₹{float(bank_data['summary']['closing_balance']):,.2f}")
+                         f"₹{float(summary['closing_balance']):,.2f}")
             with col3:
-                st.metric("Total Credits", f"₹{df['credit'].sum():,.2f}")
+                st.metric("Total Credits", f"₹{metrics['total_credits']:,.2f}")
             with col4:
-                st.metric("Total Debits", f"₹{df['debit'].sum():,.2f}")
+                st.metric("Total Debits", f"₹{metrics['total_debits']:,.2f}")
 
             # Visualizations
             st.header("📈 Financial Visualizations")
             
             # Transaction Categories Spending
-            spending_by_category = df.groupby('category')['debit'].sum()
-            fig_category = px.pie(
+            spending_by_category = category_totals['debit_sum']
+            fig_category = go.Figure(go.Pie(
+                labels=spending_by_category.index,
                 values=spending_by_category.values,
-                names=spending_by_category.index,
-                title='Spending by Category',
-                color=spending_by_category.index,
-                color_discrete_map={
-                    'BUSINESS_INCOME': 'green',
-                    'BUSINESS_EXPENSE': 'red',
-                    'PERSONAL_EXPENSE': 'blue',
-                    'TRANSFER': 'orange',
-                    'OTHERS': 'gray'
-                }
-            )
+                marker=dict(colors=[CATEGORY_COLORS.get(name) for name in spending_by_category.index]),
+                hovertemplate='%{label}: ₹%{value:,.2f}<extra></extra>'
+            ))
+            fig_category.update_layout(title='Spending by Category')
             st.plotly_chart(fig_category)
             
             # Income vs Expense Trend
-            income = df[df['category'] == 'BUSINESS_INCOME']['credit'].sum()
-            expenses = df[df['category'].isin(['BUSINESS_EXPENSE', 'PERSONAL_EXPENSE'])]['debit'].sum()
+            income = category_totals['credit_sum'].get('BUSINESS_INCOME', 0.0)
+            expenses = category_totals['debit_sum'].reindex(
+                ['BUSINESS_EXPENSE', 'PERSONAL_EXPENSE'], fill_value=0
+            ).sum()
             
-            fig_income_expense = px.bar(
+            fig_income_expense = go.Figure(go.Bar(
                 x=['Income', 'Expenses'],
                 y=[income, expenses],
-                title='Income vs Expenses Comparison'
+                hovertemplate='%{x}: ₹%{y:,.2f}<extra></extra>'
+            ))
+            fig_income_expense.update_layout(
+                title='Income vs Expenses Comparison',
+                yaxis_title='Amount (₹)'
             )
             st.plotly_chart(fig_income_expense)
             
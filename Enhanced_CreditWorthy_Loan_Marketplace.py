@@ -1,11 +1,18 @@
 import streamlit as st
 import pandas as pd
 import json
+try:
+    from orjson import loads as json_loads  # Faster statement parsing when available
+except ModuleNotFoundError:
+    from json import loads as json_loads
 import plotly.express as px
 from datetime import datetime
 import numpy as np
 import google.generativeai as genai
-import ast
+import html
+import hashlib
+import time
+from pathlib import Path
 
 # Configuration
 st.set_page_config(page_title="Enhanced Loan Marketplace", page_icon="💰", layout="wide")
@@ -40,6 +47,13 @@ st.markdown("""
         border-radius: 10px;
         margin: 10px 0;
     }
+    .loan-details {
+        display: flex;
+        gap: 20px;
+    }
+    .loan-details > div {
+        flex: 1;
+    }
     .improvement-tip {
         background-color: #fff3cd;
         padding: 10px;
@@ -49,144 +63,231 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def get_loan_types_from_gemini():
-    """Get additional loan types using Gemini AI with robust error handling"""
-    if not GOOGLE_API_KEY:
-        st.error("Gemini API key is not configured. Unable to fetch additional loan types.")
-        return {'additional_loans': []}
-    
-    try:
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        prompt = """Generate a Python dictionary containing additional business loan types with this exact structure:
+LOAN_TYPES_PROMPT = """Generate a JSON object containing additional business loan types with this exact structure:
         {
-            'additional_loans': [
+            "additional_loans": [
                 {
-                    'name': 'Equipment Financing Loan',
-                    'provider': 'Tech Finance Ltd',
-                    'type': 'Equipment Loan',
-                    'interest_rate': 11.5,
-                    'min_amount': 100000,
-                    'max_amount': 1000000,
-                    'tenure_range': (12, 48),
-                    'processing_time': '3-5 days',
-                    'processing_fee': 1.0,
-                    'suitable_for': ['Manufacturing', 'Tech Companies'],
-                    'required_documents': ['Business Registration', 'Equipment Quotation'],
-                    'features': ['Quick Processing', 'Flexible Terms'],
-                    'upgrade_criteria': {
-                        'min_credit_score': 70,
-                        'min_repayment_history': 6,
-                        'interest_reduction': 1.5
+                    "name": "Equipment Financing Loan",
+                    "provider": "Tech Finance Ltd",
+                    "type": "Equipment Loan",
+                    "interest_rate": 11.5,
+                    "min_amount": 100000,
+                    "max_amount": 1000000,
+                    "tenure_range": [12, 48],
+                    "processing_time": "3-5 days",
+                    "processing_fee": 1.0,
+                    "suitable_for": ["Manufacturing", "Tech Companies"],
+                    "required_documents": ["Business Registration", "Equipment Quotation"],
+                    "features": ["Quick Processing", "Flexible Terms"],
+                    "upgrade_criteria": {
+                        "min_credit_score": 70,
+                        "min_repayment_history": 6,
+                        "interest_reduction": 1.5
                     }
                 }
             ]
         }
         
-        Generate 5 more loan types following exactly this structure. Return only the Python dictionary."""
+        Generate 5 more loan types following exactly this structure. Return only the JSON object."""
+LOAN_CACHE_TTL = 3600  # Seconds a Gemini loan list is reused, in memory and on disk
+LOAN_CACHE_PATH = Path.home() / '.finai_cache' / 'loans.json'
 
-        response = model.generate_content(prompt)
-        
-        # Validate and clean the response
-        if not response or not response.text:
-            st.warning("Empty response from Gemini API")
-            return {'additional_loans': []}
+# Fields every AI loan needs before it can be cached and rendered
+AI_LOAN_FIELDS = {
+    'name': str,
+    'provider': str,
+    'interest_rate': (int, float),
+    'min_amount': (int, float),
+    'max_amount': (int, float),
+    'processing_time': str,
+    'processing_fee': (int, float),
+    'suitable_for': list,
+    'required_documents': list,
+    'features': list,
+    'upgrade_criteria': dict,
+}
+AI_UPGRADE_FIELDS = ('min_credit_score', 'min_repayment_history', 'interest_reduction')
 
-        # Clean the response text
-        cleaned_response = response.text.strip()
-        
-        # Remove code block markers if present
-        if cleaned_response.startswith('```') and cleaned_response.endswith('```'):
-            cleaned_response = cleaned_response.strip('`').strip()
-        if cleaned_response.startswith('python'):
-            cleaned_response = cleaned_response[6:].trip()
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _validate_ai_loans(loan_types):
+    """Raise ValueError unless every AI loan has the fields the marketplace reads"""
+    if not isinstance(loan_types, dict) or not isinstance(loan_types.get('additional_loans'), list):
+        raise ValueError("Invalid response format from Gemini API")
+    for index, loan in enumerate(loan_types['additional_loans'], start=1):
+        if not isinstance(loan, dict):
+            raise ValueError(f"Invalid loan #{index} from Gemini API: not an object")
+        for field, expected in AI_LOAN_FIELDS.items():
+            value = loan.get(field)
+            valid = _is_number(value) if expected == (int, float) else isinstance(value, expected)
+            if not valid:
+                raise ValueError(f"Invalid loan #{index} from Gemini API: bad or missing '{field}'")
+        if not all(_is_number(loan['upgrade_criteria'].get(field)) for field in AI_UPGRADE_FIELDS):
+            raise ValueError(f"Invalid loan #{index} from Gemini API: bad or missing 'upgrade_criteria'")
+        # JSON has no tuples, so the prompt asks for a [min, max] list
+        tenure_range = loan.get('tenure_range')
+        if not (isinstance(tenure_range, list) and len(tenure_range) == 2
+                and all(map(_is_number, tenure_range))):
+            raise ValueError(f"Invalid loan #{index} from Gemini API: bad or missing 'tenure_range'")
+
+def _read_loan_disk_cache():
+    try:
+        with open(LOAN_CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _with_tenure_tuples(loan_types):
+    """JSON has no tuples; restore tenure ranges to the (min, max) form the base loans use"""
+    for loan in loan_types['additional_loans']:
+        loan['tenure_range'] = tuple(loan['tenure_range'])
+    return loan_types
+
+def _write_loan_disk_cache(prompt_key, loan_types):
+    """Best-effort persistence so restarts reuse the last good Gemini answer"""
+    cache = _read_loan_disk_cache()
+    cache[prompt_key] = {'timestamp': time.time(), 'loan_types': loan_types}
+    try:
+        LOAN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(LOAN_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+@st.cache_resource
+def get_gemini(model_name):
+    """Reuse one model handle across reruns and sessions; the SDK is configured at import"""
+    return genai.GenerativeModel(model_name)
 
+@st.cache_data(ttl=LOAN_CACHE_TTL, show_spinner="Loading loans…")
+def _fetch_ai_loans(prompt):
+    """
+    Parsed Gemini loan types for a prompt, reused from disk while younger than LOAN_CACHE_TTL.
+    Raises on empty or malformed responses so failures are never cached.
+    """
+    prompt_key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    cached = _read_loan_disk_cache().get(prompt_key)
+    if cached and time.time() - cached.get('timestamp', 0) < LOAN_CACHE_TTL:
         try:
-            # Use ast.literal_eval for safer parsing
-            loan_types = ast.literal_eval(cleaned_response)
-            
-            # Validate the structure
-            if not isinstance(loan_types, dict) or 'additional_loans' not in loan_types:
-                st.warning("Invalid response format from Gemini API")
-                return {'additional_loans': []}
-            
-            return loan_types
-        
-        except (SyntaxError, ValueError) as se:
-            st.error(f"Error parsing Gemini response: {se}")
-            st.error(f"Problematic response text: {cleaned_response}")
-            return {'additional_loans': []}
-            
+            _validate_ai_loans(cached.get('loan_types'))
+            return _with_tenure_tuples(cached['loan_types'])
+        except ValueError:
+            pass  # A bad entry from before loans were validated; fetch a fresh one
+
+    response = get_gemini('gemini-2.0-flash-exp').generate_content(prompt)
+
+    # Validate and clean the response
+    if not response or not response.text:
+        raise ValueError("Empty response from Gemini API")
+
+    # Clean the response text
+    cleaned_response = response.text.strip()
+
+    # Remove code block markers if present
+    if cleaned_response.startswith('```') and cleaned_response.endswith('```'):
+        cleaned_response = cleaned_response.strip('`').strip()
+    if cleaned_response.startswith('json'):
+        cleaned_response = cleaned_response[4:].strip()
+
+    try:
+        loan_types = json_loads(cleaned_response)
+    except ValueError as je:
+        raise ValueError(
+            f"Error parsing Gemini response: {je}\nProblematic response text: {cleaned_response}"
+        ) from je
+
+    # Validate the structure and every loan before anything is cached
+    _validate_ai_loans(loan_types)
+
+    _write_loan_disk_cache(prompt_key, loan_types)
+    return _with_tenure_tuples(loan_types)
+
+def get_loan_types_from_gemini():
+    """Get additional loan types using Gemini AI with robust error handling"""
+    if not GOOGLE_API_KEY:
+        st.error("Gemini API key is not configured. Unable to fetch additional loan types.")
+        return {'additional_loans': []}
+    
+    try:
+        return _fetch_ai_loans(LOAN_TYPES_PROMPT)
+    except ValueError as ve:
+        st.warning(str(ve))
+        return {'additional_loans': []}
     except Exception as e:
         st.error(f"Unexpected error fetching additional loan types: {str(e)}")
         return {'additional_loans': []}
 
-def load_loan_database():
-    """Load comprehensive loan database with contextual information"""
-    base_loans = {
-        'premium_loans': [
-            {
-                'name': 'Business Growth Plus',
-                'provider': 'Premium Finance',
-                'type': 'Premium Business Loan',
-                'interest_rate': 8.5,
-                'min_amount': 500000,
-                'max_amount': 2000000,
-                'tenure_range': (12, 60),
-                'processing_time': '3-5 days',
-                'processing_fee': 0.5,
-                'suitable_for': ['Established Businesses', 'High Growth Startups'],
-                'required_documents': ['2 Years Tax Returns', 'Business Plan', 'Financial Statements'],
-                'features': ['Lower Interest Rates', 'Higher Limits', 'Flexible Repayment'],
-                'upgrade_criteria': {
-                    'min_credit_score': 80,
-                    'min_repayment_history': 6,
-                    'interest_reduction': 2.0
-                }
+# Built-in loan catalogue, shared by every rerun; AI-generated loans are merged on top
+BASE_LOANS = {
+    'premium_loans': [
+        {
+            'name': 'Business Growth Plus',
+            'provider': 'Premium Finance',
+            'type': 'Premium Business Loan',
+            'interest_rate': 8.5,
+            'min_amount': 500000,
+            'max_amount': 2000000,
+            'tenure_range': (12, 60),
+            'processing_time': '3-5 days',
+            'processing_fee': 0.5,
+            'suitable_for': ['Established Businesses', 'High Growth Startups'],
+            'required_documents': ['2 Years Tax Returns', 'Business Plan', 'Financial Statements'],
+            'features': ['Lower Interest Rates', 'Higher Limits', 'Flexible Repayment'],
+            'upgrade_criteria': {
+                'min_credit_score': 80,
+                'min_repayment_history': 6,
+                'interest_reduction': 2.0
             }
-        ],
-        'government_schemes': [
-            {
-                'name': 'PM Street Vendor AtmaNirbhar Nidhi',
-                'provider': 'Government of India',
-                'type': 'Micro Enterprise Loan',
-                'interest_rate': 7.0,
-                'min_amount': 10000,
-                'max_amount': 50000,
-                'tenure_range': (6, 24),
-                'processing_time': '5-7 days',
-                'processing_fee': 0,
-                'suitable_for': ['Street Vendors', 'Small Shop Owners'],
-                'required_documents': ['Aadhaar Card', 'Vendor Certificate'],
-                'features': ['No Collateral Required', 'Zero Processing Fee'],
-                'upgrade_criteria': {
-                    'min_credit_score': 65,
-                    'min_repayment_history': 3,
-                    'interest_reduction': 1.0
-                }
+        }
+    ],
+    'government_schemes': [
+        {
+            'name': 'PM Street Vendor AtmaNirbhar Nidhi',
+            'provider': 'Government of India',
+            'type': 'Micro Enterprise Loan',
+            'interest_rate': 7.0,
+            'min_amount': 10000,
+            'max_amount': 50000,
+            'tenure_range': (6, 24),
+            'processing_time': '5-7 days',
+            'processing_fee': 0,
+            'suitable_for': ['Street Vendors', 'Small Shop Owners'],
+            'required_documents': ['Aadhaar Card', 'Vendor Certificate'],
+            'features': ['No Collateral Required', 'Zero Processing Fee'],
+            'upgrade_criteria': {
+                'min_credit_score': 65,
+                'min_repayment_history': 3,
+                'interest_reduction': 1.0
             }
-        ],
-        'startup_loans': [
-            {
-                'name': 'Digital Startup Boost',
-                'provider': 'StartupFin',
-                'type': 'Startup Loan',
-                'interest_rate': 10.5,
-                'min_amount': 200000,
-                'max_amount': 1000000,
-                'tenure_range': (12, 36),
-                'processing_time': '4-6 days',
-                'processing_fee': 1.0,
-                'suitable_for': ['Tech Startups', 'Digital Services'],
-                'required_documents': ['Startup Registration', 'Business Plan', 'Founder KYC'],
-                'features': ['Mentorship Support', 'Network Access', 'Flexible Repayment'],
-                'upgrade_criteria': {
-                    'min_credit_score': 75,
-                    'min_repayment_history': 4,
-                    'interest_reduction': 1.5
-                }
+        }
+    ],
+    'startup_loans': [
+        {
+            'name': 'Digital Startup Boost',
+            'provider': 'StartupFin',
+            'type': 'Startup Loan',
+            'interest_rate': 10.5,
+            'min_amount': 200000,
+            'max_amount': 1000000,
+            'tenure_range': (12, 36),
+            'processing_time': '4-6 days',
+            'processing_fee': 1.0,
+            'suitable_for': ['Tech Startups', 'Digital Services'],
+            'required_documents': ['Startup Registration', 'Business Plan', 'Founder KYC'],
+            'features': ['Mentorship Support', 'Network Access', 'Flexible Repayment'],
+            'upgrade_criteria': {
+                'min_credit_score': 75,
+                'min_repayment_history': 4,
+                'interest_reduction': 1.5
             }
-        ]
-    }
+        }
+    ]
+}
+
+def load_loan_database():
+    """Load comprehensive loan database with contextual information"""
+    base_loans = dict(BASE_LOANS)
     
     # Add AI-generated loan types
     ai_loans = get_loan_types_from_gemini()
@@ -201,13 +302,15 @@ def calculate_credit_score(transactions_df):
     debit_sum = transactions_df['debit'].sum()
     balance_trend = transactions_df['balance'].diff().mean()
     transaction_consistency = len(transactions_df) / 30  # Normalized by month
+    # Compare on the raw array; NaN debits still count as non-positive
+    all_debits_positive = bool((transactions_df['debit'].to_numpy() > 0).all())
     
     # Detailed scoring components
     components = {
         'income_stability': min(30, (credit_sum / debit_sum) * 15) if debit_sum > 0 else 30,
         'balance_growth': 25 if balance_trend > 0 else 10,
         'transaction_history': min(25, transaction_consistency * 5),
-        'payment_regularity': 20 if (transactions_df['debit'] > 0).all() else 10
+        'payment_regularity': 20 if all_debits_positive else 10
     }
     
     total_score = sum(components.values())
@@ -226,10 +329,16 @@ def get_credit_improvement_tips(credit_components):
         tips.append("Ensure regular and timely bill payments")
     return tips
 
-def calculate_loan_upgrade_eligibility(transactions_df, current_loan):
-    """Calculate eligibility for loan upgrades"""
-    credit_score, _ = calculate_credit_score(transactions_df)
-    monthly_income = transactions_df['credit'].mean()
+def _is_eligible(loan, credit_score, monthly_income):
+    """Basic marketplace eligibility for one loan"""
+    return credit_score >= 60 and monthly_income > loan['min_amount'] * 0.1
+
+def calculate_loan_upgrade_eligibility(transactions_df, current_loan, credit_score=None, monthly_income=None):
+    """Calculate eligibility for loan upgrades; pass credit_score/monthly_income to reuse computed values"""
+    if credit_score is None:
+        credit_score, _ = calculate_credit_score(transactions_df)
+    if monthly_income is None:
+        monthly_income = transactions_df['credit'].mean()
     
     upgrade_eligible = (
         credit_score >= current_loan['upgrade_criteria']['min_credit_score'] and
@@ -243,6 +352,94 @@ def calculate_loan_upgrade_eligibility(transactions_df, current_loan):
         'max_amount_increase': monthly_income * 12 if upgrade_eligible else 0
     }
 
+@st.cache_data(show_spinner=False)
+def _load_statement(file_bytes):
+    """Parse uploaded statement bytes once; reruns with the same file reuse the DataFrame"""
+    data = json_loads(file_bytes)
+    return pd.DataFrame(data['transactions'])
+
+def _esc(value):
+    return html.escape(str(value))
+
+def _html_list(items):
+    return '<ul>' + ''.join(f"<li>{_esc(item)}</li>" for item in items) + '</ul>'
+
+def _render_loan_card(loan, is_eligible, upgrade_info=None):
+    """One HTML blob per loan (header plus collapsible details) so each card is a single element"""
+    details = [
+        '<h4>Loan Details</h4>',
+        f"<p>Interest Rate: {_esc(loan['interest_rate'])}% p.a.</p>",
+        f"<p>Amount Range: ₹{loan['min_amount']:,} - ₹{loan['max_amount']:,}</p>",
+        f"<p>Processing Time: {_esc(loan['processing_time'])}</p>",
+        f"<p>Processing Fee: {_esc(loan['processing_fee'])}%</p>",
+    ]
+    if upgrade_info is not None:
+        details.append('<h4>Upgrade Potential</h4>')
+        if upgrade_info['eligible']:
+            details += [
+                '<div class="upgrade-card"><h4>🌟 Upgrade Available!</h4></div>',
+                f"<p>New Interest Rate: {upgrade_info['new_interest_rate']}%</p>",
+                f"<p>Additional Amount Available: ₹{upgrade_info['max_amount_increase']:,.2f}</p>",
+            ]
+        else:
+            details.append('<p>Complete 6 months of timely repayments to unlock upgrades</p>')
+    
+    requirements = [
+        '<h4>Required Documents</h4>', _html_list(loan['required_documents']),
+        '<h4>Features</h4>', _html_list(loan['features']),
+    ]
+    if is_eligible:
+        requirements += ['<h4>Suitable For</h4>', _html_list(loan['suitable_for'])]
+    
+    return (
+        '<div class="loan-card">'
+        f"<h3>{_esc(loan['name'])} by {_esc(loan['provider'])}</h3>"
+        f"<p>{'🟢 Eligible' if is_eligible else '🔴 Not Eligible'}</p>"
+        '<details><summary>View Details</summary><div class="loan-details">'
+        f"<div>{''.join(details)}</div><div>{''.join(requirements)}</div>"
+        '</div></details></div>'
+    )
+
+@st.fragment
+def _marketplace_fragment(transactions_df, loan_database, credit_score, monthly_income):
+    """Filters and loan cards; widget changes here rerun only this fragment"""
+    # Fragment reruns skip main(), so errors are reported here the same way
+    try:
+        # Filters
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            loan_type = st.selectbox(
+                "Loan Type",
+                ['All'] + list(loan_database.keys())
+            )
+        with col2:
+            max_interest = st.slider("Maximum Interest Rate (%)", 5.0, 20.0, 15.0)
+        with col3:
+            processing_time = st.selectbox(
+                "Processing Time",
+                ['All', 'Within 2 days', '2-5 days', '5+ days']
+            )
+
+        # Display loans
+        for category, loans in loan_database.items():
+            if loan_type == 'All' or loan_type == category:
+                for loan in loans:
+                    if loan['interest_rate'] <= max_interest:
+                        # Calculate eligibility
+                        is_eligible = _is_eligible(loan, credit_score, monthly_income)
+                        
+                        upgrade_info = None
+                        if is_eligible:
+                            # Calculate upgrade eligibility
+                            upgrade_info = calculate_loan_upgrade_eligibility(
+                                transactions_df, loan, credit_score=credit_score, monthly_income=monthly_income
+                            )
+                        
+                        # Display loan card
+                        st.markdown(_render_loan_card(loan, is_eligible, upgrade_info), unsafe_allow_html=True)
+    except Exception as e:
+        st.error(f"Error processing file: {str(e)}")
+
 def display_loan_marketplace(transactions_df):
     """Enhanced loan marketplace interface with upgrade options"""
     st.header("🏦 Enhanced Loan Marketplace")
@@ -263,82 +460,9 @@ def display_loan_marketplace(transactions_df):
         for tip in tips:
             st.markdown(f"* {tip}")
     
-    # Filters
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        loan_type = st.selectbox(
-            "Loan Type",
-            ['All'] + list(loan_database.keys())
-        )
-    with col2:
-        max_interest = st.slider("Maximum Interest Rate (%)", 5.0, 20.0, 15.0)
-    with col3:
-        processing_time = st.selectbox(
-            "Processing Time",
-            ['All', 'Within 2 days', '2-5 days', '5+ days']
-        )
-
-    # Display loans
-    for category, loans in loan_database.items():
-        if loan_type == 'All' or loan_type == category:
-            for loan in loans:
-                if loan['interest_rate'] <= max_interest:
-                    # Calculate eligibility
-                    monthly_income = transactions_df['credit'].mean()
-                    is_eligible = (
-                        credit_score >= 60 and
-                        monthly_income > loan['min_amount'] * 0.1
-                    )
-                    
-                    # Display loan card
-                    st.markdown(f"""
-                    <div class="loan-card">
-                        <h3>{loan['name']} by {loan['provider']}</h3>
-                        <p>{'🟢 Eligible' if is_eligible else '🔴 Not Eligible'}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    with st.expander("View Details"):
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.subheader("Loan Details")
-                            st.write(f"Interest Rate: {loan['interest_rate']}% p.a.")
-                            st.write(f"Amount Range: ₹{loan['min_amount']:,} - ₹{loan['max_amount']:,}")
-                            st.write(f"Processing Time: {loan['processing_time']}")
-                            st.write(f"Processing Fee: {loan['processing_fee']}%")
-                            
-                            if is_eligible:
-                                # Calculate upgrade eligibility
-                                upgrade_info = calculate_loan_upgrade_eligibility(
-                                    transactions_df, loan
-                                )
-                                
-                                st.subheader("Upgrade Potential")
-                                if upgrade_info['eligible']:
-                                    st.markdown("""
-                                    <div class="upgrade-card">
-                                        <h4>🌟 Upgrade Available!</h4>
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                                    st.write(f"New Interest Rate: {upgrade_info['new_interest_rate']}%")
-                                    st.write(f"Additional Amount Available: ₹{upgrade_info['max_amount_increase']:,.2f}")
-                                else:
-                                    st.write("Complete 6 months of timely repayments to unlock upgrades")
-                        
-                        with col2:
-                            st.subheader("Required Documents")
-                            for doc in loan['required_documents']:
-                                st.write(f"- {doc}")
-                            
-                            st.subheader("Features")
-                            for feature in loan['features']:
-                                st.write(f"- {feature}")
-                            
-                            if is_eligible:
-                                st.subheader("Suitable For")
-                                for business_type in loan['suitable_for']:
-                                    st.write(f"- {business_type}")
+    # Filters and loan cards rerun on their own when a filter changes
+    monthly_income = transactions_df['credit'].mean()
+    _marketplace_fragment(transactions_df, loan_database, credit_score, monthly_income)
 
 def main():
     st.title("💰 Enhanced CreditWorthy Loan Marketplace")
@@ -347,8 +471,7 @@ def main():
     
     if uploaded_file is not None:
         try:
-            data = json.load(uploaded_file)
-            transactions_df = pd.DataFrame(data['transactions'])
+            transactions_df = _load_statement(uploaded_file.getvalue())
             display_loan_marketplace(transactions_df)
         except Exception as e:
             st.error(f"Error processing file: {str(e)}")
@@ -1,115 +1,139 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import json
-import plotly.express as px
+try:
+    from orjson import loads as json_loads  # Faster statement parsing when available
+except ModuleNotFoundError:
+    from json import loads as json_loads
+import re
 import plotly.graph_objects as go
 from datetime import datetime
-import re
 
-def clean_date(date_str):
-    """Clean date string by removing INB suffix if present"""
-    return re.sub(r'INB$', '', date_str)
+AMOUNT_COLUMNS = ['credit', 'debit', 'balance']
+DISPLAY_COLUMNS = ['date', 'description', 'credit', 'debit', 'balance', 'category']
+DISPLAY_ROWS = 500  # Rows shown in the transactions table before "Show all"
 
 def prepare_transaction_data(transactions):
     df = pd.DataFrame(transactions)
     
-    # Clean date strings and convert to datetime
-    df['date'] = df['date'].apply(clean_date)
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%y')
+    # Strip the INB suffix and convert to datetime; repeated dates are parsed once
+    df['date'] = pd.to_datetime(df['date'].str.removesuffix('INB'), format='%d-%m-%y', cache=True)
     df['month'] = df['date'].dt.month
     df['day_of_week'] = df['date'].dt.dayofweek
     
-    # Convert amount columns to float
-    df['credit'] = pd.to_numeric(df['credit'], errors='coerce').fillna(0)
-    df['debit'] = pd.to_numeric(df['debit'], errors='coerce').fillna(0)
-    df['balance'] = pd.to_numeric(df['balance'], errors='coerce').fillna(0)
-    
-    return df
-
-def categorize_nano_entrepreneur_transactions(description):
-    """Enhanced transaction categorization for nano-entrepreneurs"""
-    categories = {
-        'BUSINESS_INCOME': ['SALARY', 'INVESTMENT', 'BONUS', 'RETURNS', 'CREDIT'],
-        'BUSINESS_EXPENSE': ['UTILITY', 'BILL', 'SHOPPING', 'STORE'],
-        'PERSONAL_EXPENSE': ['COFFEE', 'FOOD', 'BEVERAGES'],
-        'TRANSFER': ['RENT', 'TRANSFER', 'REFUND'],
-        'OTHERS': []
-    }
+    # Convert amount columns to numbers in one pass; JSON numbers usually arrive
+    # numeric already, in which case only the missing values need filling
+    amounts = df[AMOUNT_COLUMNS]
+    if not all(map(pd.api.types.is_numeric_dtype, amounts.dtypes)):
+        amounts = amounts.apply(pd.to_numeric, errors='coerce')
+    df[AMOUNT_COLUMNS] = amounts.fillna(0)
     
-    description = str(description).upper()
-    for category, keywords in categories.items():
-        if any(keyword in description for keyword in keywords):
-            return category
-    return 'OTHERS'
+    # Sort chronologically once; the stable sort keeps statement order within a day,
+    # and the newest-first table is just the reversed frame
+    return df.sort_values('date', kind='mergesort')
+
+@st.cache_data(show_spinner=False)
+def _load_statement(file_bytes):
+    """Parse uploaded statement bytes once; reruns with the same file reuse the result"""
+    bank_data = json_loads(file_bytes)
+    df = prepare_transaction_data(bank_data['transactions'])
+    return df, bank_data['personal_info'], bank_data['summary']
+
+# Checked in priority order: a description matching several categories gets the first one
+TRANSACTION_CATEGORIES = {
+    'BUSINESS_INCOME': ['SALARY', 'INVESTMENT', 'BONUS', 'RETURNS', 'CREDIT'],
+    'BUSINESS_EXPENSE': ['UTILITY', 'BILL', 'SHOPPING', 'STORE'],
+    'PERSONAL_EXPENSE': ['COFFEE', 'FOOD', 'BEVERAGES'],
+    'TRANSFER': ['RENT', 'TRANSFER', 'REFUND'],
+    'OTHERS': []
+}
+CATEGORY_PATTERNS = {
+    category: re.compile('|'.join(map(re.escape, keywords)))
+    for category, keywords in TRANSACTION_CATEGORIES.items() if keywords
+}
+
+def categorize_nano_entrepreneur_transactions(descriptions):
+    """Enhanced transaction categorization for nano-entrepreneurs, vectorized over a Series"""
+    upper = descriptions.astype(str).str.upper()
+    masks = [upper.str.contains(pattern, na=False) for pattern in CATEGORY_PATTERNS.values()]
+    labels = np.select(masks, list(CATEGORY_PATTERNS), default='OTHERS')
+    return pd.Series(labels, index=descriptions.index)
 
 def calculate_financial_metrics(df, summary_data):
     metrics = {}
     
+    # Work on the raw arrays and build each mask once
+    credit = df['credit'].to_numpy()
+    debit = df['debit'].to_numpy()
+    balance = df['balance'].to_numpy()
+    credit_mask = credit > 0
+    debit_mask = debit > 0
+    credit_txns = int(credit_mask.sum())
+    
     # Basic transaction metrics
     metrics['total_transactions'] = len(df)
-    metrics['total_credits'] = df['credit'].sum()
-    metrics['total_debits'] = df['debit'].sum()
+    metrics['total_credits'] = credit.sum()
+    metrics['total_debits'] = debit.sum()
     metrics['net_cashflow'] = metrics['total_credits'] - metrics['total_debits']
     
     # Balance metrics
     metrics['opening_balance'] = float(summary_data.get('opening_balance', 0))
     metrics['closing_balance'] = float(summary_data.get('closing_balance', 0))
-    metrics['avg_balance'] = df['balance'].mean()
-    metrics['balance_volatility'] = df['balance'].std()
+    metrics['avg_balance'] = balance.mean() if balance.size else np.nan
+    metrics['balance_volatility'] = balance.std(ddof=1) if balance.size > 1 else np.nan  # sample std, as pandas
     
     # Transaction patterns
-    metrics['avg_transaction_size'] = df['debit'][df['debit'] > 0].mean()
+    metrics['avg_transaction_size'] = debit[debit_mask].mean() if debit_mask.any() else np.nan
     metrics['transaction_frequency'] = len(df) / 30  # transactions per day
     
     # Credit patterns
-    credit_txns = len(df[df['credit'] > 0])
     metrics['credit_frequency'] = credit_txns / max(len(df), 1)
-    metrics['avg_credit_amount'] = df[df['credit'] > 0]['credit'].mean() if credit_txns > 0 else 0
+    metrics['avg_credit_amount'] = credit[credit_mask].mean() if credit_txns > 0 else 0
     
     return metrics
 
+SCORE_COMPONENTS = ('Income Stability', 'Business Resilience', 'Transaction Discipline', 'Growth Potential')
+SCORE_CAPS = np.array([40, 30, 20, 10])  # Maximum points per component
+
 def calculate_nano_entrepreneur_score(metrics):
     """
     Custom scoring for nano-entrepreneurs considering unique financial patterns
     """
-    # Income Stability (40 points)
-    income_stability = min(
+    raw_scores = np.array([
+        # Income Stability (40 points)
         metrics['credit_frequency'] * 20 +  # Frequency of income
-        (metrics['avg_credit_amount'] > 10000) * 20  # Consistent income threshold
-    , 40)
-    
-    # Business Resilience (30 points)
-    business_resilience = min(
+        (metrics['avg_credit_amount'] > 10000) * 20,  # Consistent income threshold
+        
+        # Business Resilience (30 points)
         (metrics['net_cashflow'] > 0) * 20 +  # Positive cash flow
-        (metrics['balance_volatility'] < metrics['avg_balance'] * 0.3) * 10  # Low balance fluctuation
-    , 30)
-    
-    # Transaction Discipline (20 points)
-    transaction_discipline = min(
+        (metrics['balance_volatility'] < metrics['avg_balance'] * 0.3) * 10,  # Low balance fluctuation
+        
+        # Transaction Discipline (20 points)
         (metrics['transaction_frequency'] > 0.5) * 10 +  # Regular transactions
-        (metrics['avg_transaction_size'] < metrics['avg_credit_amount'] * 0.5) * 10  # Controlled spending
-    , 20)
-    
-    # Growth Potential (10 points)
-    growth_potential = min(
+        (metrics['avg_transaction_size'] < metrics['avg_credit_amount'] * 0.5) * 10,  # Controlled spending
+        
+        # Growth Potential (10 points)
         (metrics['closing_balance'] > metrics['opening_balance']) * 5 +
         (metrics['total_credits'] > metrics['total_debits']) * 5
-    , 10)
+    ], dtype=np.float64)
     
-    # Total Nano-Entrepreneur Score
-    nano_score = income_stability + business_resilience + transaction_discipline + growth_potential
+    # Cap every component at once; the total is the Nano-Entrepreneur Score
+    parts = np.minimum(raw_scores, SCORE_CAPS)
+    nano_score = parts.sum()
     
     return {
-        'score': min(max(nano_score, 0), 100),
-        'breakdown': {
-            'Income Stability': income_stability,
-            'Business Resilience': business_resilience,
-            'Transaction Discipline': transaction_discipline,
-            'Growth Potential': growth_potential
-        }
+        'score': float(np.clip(nano_score, 0, 100)),
+        'breakdown': dict(zip(SCORE_COMPONENTS, parts.tolist()))
     }
 
+CATEGORY_COLORS = {
+    'BUSINESS_INCOME': 'green',
+    'BUSINESS_EXPENSE': 'red',
+    'PERSONAL_EXPENSE': 'blue',
+    'TRANSFER': 'orange',
+    'OTHERS': 'gray'
+}
+
 def main():
     st.set_page_config(page_title="Nano Entrepreneur Financial Analysis", layout="wide")
     st.title("Nano Entrepreneur Financial Analysis Platform")
@@ -118,22 +142,24 @@ def main():
     
     if uploaded_file is not None:
         try:
-            bank_data = json.load(uploaded_file)
+            df, personal_info, summary = _load_statement(uploaded_file.getvalue())
             
             # Process transactions
-            df = prepare_transaction_data(bank_data['transactions'])
-            df['category'] = df['description'].apply(categorize_nano_entrepreneur_transactions)
+            df['category'] = pd.Categorical(
+                categorize_nano_entrepreneur_transactions(df['description']),
+                categories=list(TRANSACTION_CATEGORIES)
+            )
             
             # Customer Information
             st.header("Entrepreneur Profile")
             col1, col2 = st.columns(2)
             with col1:
-                st.write("Name:", bank_data['personal_info'].get('customer_id', 'N/A'))
-                st.write("Mobile:", bank_data['personal_info'].get('mobile', 'N/A'))
-                st.write("KYC Status:", bank_data['personal_info'].get('kyc_status', 'N/A'))
+                st.write("Name:", personal_info.get('customer_id', 'N/A'))
+                st.write("Mobile:", personal_info.get('mobile', 'N/A'))
+                st.write("KYC Status:", personal_info.get('kyc_status', 'N/A'))
             
             # Calculate financial metrics
-            metrics = calculate_financial_metrics(df, bank_data['summary'])
+            metrics = calculate_financial_metrics(df, summary)
             
             # Nano Entrepreneur Score
             nano_score = calculate_nano_entrepreneur_score(metrics)
@@ -171,43 +197,35 @@ def main():
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.metric("Opening Balance", 
-                         f"₹{float(bank_data['summary']['opening_balance']):,.2f}")
+                         f"₹{float(summary['opening_balance']):,.2f}")
             with col2:
                 st.metric("Closing Balance", 
-                         f"₹{float(bank_data['summary']['closing_balance']):,.2f}")
+                         f"₹{float(summary['closing_balance']):,.2f}")
             with col3:
-                st.metric("Total Credits", f"₹{df['credit'].sum():,.2f}")
+                st.metric("Total Credits", f"₹{metrics['total_credits']:,.2f}")
             with col4:
-                st.metric("Total Debits", f"₹{df['debit'].sum():,.2f}")
+                st.metric("Total Debits", f"₹{metrics['total_debits']:,.2f}")
 
             st.header("Detailed Transactions")
-            st.dataframe(df[['date', 'description', 'credit', 'debit', 'balance', 'category']]
-                        .sort_values('date', ascending=False))
-
-            # Transaction Categories Spending
-            # spending_by_category = df.groupby('category')['debit'].sum()
-            # fig_category = px.pie(
-            #     values=spending_by_category.values,
-            #     names=spending_by_category.index,
-            #     title='Spending by Category'
-            # )
-            # st.plotly_chart(fig_category)
-
-            # Transaction Categories Spending
-            spending_by_category = df.groupby('category')['debit'].sum()
-            fig_category = px.pie(
-                values=spending_by_category.values,
-                names=spending_by_category.index,
-                title='Spending by Category',
-                color=spending_by_category.index,
-                color_discrete_map={
-                    'BUSINESS_INCOME': 'green',
-                    'BUSINESS_EXPENSE': 'red',
-                    'PERSONAL_EXPENSE': 'blue',
-                    'TRANSFER': 'orange',
-                    'OTHERS': 'gray'
-                }
-                )
+            newest_first = df[DISPLAY_COLUMNS].iloc[::-1]
+            # Only one table is sent to the browser; the full one only on request
+            if len(newest_first) > DISPLAY_ROWS and st.toggle(f"Show all {len(newest_first)} transactions"):
+                st.dataframe(newest_first)
+            else:
+                st.dataframe(newest_first.head(DISPLAY_ROWS))
+
+            # Transaction Categories Spending, summed over the category codes in one
+            # pass; only categories present in the statement get a slice
+            codes = df['category'].cat.codes.to_numpy()
+            n_categories = len(TRANSACTION_CATEGORIES)
+            observed = np.bincount(codes, minlength=n_categories) > 0
+            spending = np.bincount(codes, weights=df['debit'].to_numpy(), minlength=n_categories)
+            names = np.array(list(TRANSACTION_CATEGORIES))[observed]
+            fig_category = go.Figure(go.Pie(labels=names,
+                                            values=spending[observed],
+                                            marker=dict(colors=[CATEGORY_COLORS.get(name) for name in names]),
+                                            hovertemplate='%{label}: ₹%{value:,.2f}<extra></extra>'))
+            fig_category.update_layout(title='Spending by Category')
             st.plotly_chart(fig_category)
 
             
@@ -216,24 +234,29 @@ def main():
             st.header("Income vs Expenses")
 
             # Daily Balance Trend
+            # One point per transaction, so long statements are drawn with WebGL
             fig_balance = go.Figure()
-            fig_balance.add_trace(go.Scatter(x=df['date'],
-                                           y=df['balance'],
-                                           name='Balance',
-                                           line=dict(color='blue')))
+            fig_balance.add_trace(go.Scattergl(x=df['date'],
+                                             y=df['balance'],
+                                             name='Balance',
+                                             line=dict(color='blue')))
             fig_balance.update_layout(title='Daily Balance Trend',
                                     xaxis_title='Date',
                                     yaxis_title='Balance (₹)')
             st.plotly_chart(fig_balance)
 
-            income = df[df['category'] == 'BUSINESS_INCOME']['credit'].sum()
-            expenses = df[df['category'].isin(['BUSINESS_EXPENSE', 'PERSONAL_EXPENSE'])]['debit'].sum()
+            # Mask the amount arrays on the category codes instead of filtering whole frames
+            categories = df['category'].cat.categories
+            income_mask = codes == categories.get_loc('BUSINESS_INCOME')
+            expense_mask = np.isin(codes, categories.get_indexer(['BUSINESS_EXPENSE', 'PERSONAL_EXPENSE']))
+            income = df['credit'].to_numpy()[income_mask].sum()
+            expenses = df['debit'].to_numpy()[expense_mask].sum()
             
-            fig_income_expense = px.bar(
-                x=['Income', 'Expenses'],
-                y=[income, expenses],
-                title='Income vs Expenses Comparison'
-            )
+            fig_income_expense = go.Figure(go.Bar(x=['Income', 'Expenses'],
+                                                  y=[income, expenses],
+                                                  hovertemplate='%{x}: ₹%{y:,.2f}<extra></extra>'))
+            fig_income_expense.update_layout(title='Income vs Expenses Comparison',
+                                             yaxis_title='Amount (₹)')
             st.plotly_chart(fig_income_expense)
             
         except Exception as e: